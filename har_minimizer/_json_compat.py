@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import orjson
+
+_INT64_LIMIT = float(2**63)
+
+
+class NonFiniteFloat(float):
+    """标准库解析出的 NaN / ±Infinity。
+
+    orjson 编码非有限浮点数时会静默写成 null；它不编码 float 子类而是抛出 JSONEncodeError，
+    调用方据此退回标准库，原样写回 NaN / Infinity。
+    """
+
+    __slots__ = ()
+
+
+def parse_constant(name: str) -> float:
+    return NonFiniteFloat(name)
+
+
+def _has_widened_integer(data: Any) -> bool:
+    # orjson 会把超出 64 位的整数字面量静默解析为浮点数，这类值必然是绝对值不小于 2**63 的整数
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, float) and abs(node) >= _INT64_LIMIT and node.is_integer():
+            return True
+    return False
+
+
+def loads(content: bytes) -> Any:
+    """优先用 orjson 解析；遇到 orjson 拒绝的写法（NaN、孤立代理项等）或被截断精度的大整数时改用标准库。"""
+    try:
+        data = orjson.loads(content)
+    except orjson.JSONDecodeError:
+        pass
+    else:
+        if not _has_widened_integer(data):
+            return data
+    return json.loads(content.decode("utf-8"), parse_constant=parse_constant)
@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+import functools
+import re
+
+
+@functools.lru_cache(maxsize=512)
+def compile_re(pattern: str, flags: int = 0) -> re.Pattern:
+    """带缓存的 re.compile，筛选、对比、最小化共用同一份已编译正则。"""
+    return re.compile(pattern, flags)
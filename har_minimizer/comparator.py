@@ -2,33 +2,62 @@ from __future__ import annotations
 
 import math
 import re
-from typing import List
+from typing import Callable, List
 
+from ._regex_cache import compile_re
 from .config import ComparatorConfig
 from .models import ResponseSnapshot
 
+try:
+    import ahocorasick
+except ImportError:  # 可选依赖：pip install har-minimizer[speedups]
+    ahocorasick = None
+
+# 词条较少时逐个 `in` 扫描更快，超过该数量才改用 Aho-Corasick 自动机单次扫描
+_AUTOMATON_MIN_TOKENS = 16
+
+
+def _build_automaton(tokens: List[str]):
+    if ahocorasick is None or len(tokens) < _AUTOMATON_MIN_TOKENS or "" in tokens:
+        return None
+    automaton = ahocorasick.Automaton()
+    for token in tokens:
+        automaton.add_word(token, token)
+    automaton.make_automaton()
+    return automaton
+
 
 class ResponseComparator:
     def __init__(self, config: ComparatorConfig):
         self.config = config
-        self._regex = [re.compile(expr, re.MULTILINE) for expr in config.regex]
+        # 各正则需全部命中，无法合并为单个交替式；仅去掉重复项避免多余扫描
+        self._regex = [compile_re(expr, re.MULTILINE) for expr in dict.fromkeys(config.regex)]
+        self._all_tokens = list(dict.fromkeys(config.need_all))
+        self._any_tokens = list(dict.fromkeys(config.need_any))
+        self._all_automaton = _build_automaton(self._all_tokens)
+        self._any_automaton = _build_automaton(self._any_tokens)
+        # 已启用的检查按由廉价到昂贵排列，equivalent 中短路求值，状态码/长度不符时不再扫描响应体
+        self._checks: List[Callable[[ResponseSnapshot, ResponseSnapshot], bool]] = []
+        if config.status_code:
+            self._checks.append(self._status_equal)
+        if config.length_check:
+            self._checks.append(self._length_within)
+        if self._all_tokens:
+            self._checks.append(lambda base, cand: self._need_all(cand))
+        if self._any_tokens:
+            self._checks.append(lambda base, cand: self._need_any(cand))
+        if self._regex:
+            self._checks.append(lambda base, cand: self._regex_match(cand))
+        self._any_logic = config.logic.upper() == "OR"
 
     def equivalent(self, baseline: ResponseSnapshot, candidate: ResponseSnapshot) -> bool:
         if not baseline.ok() or not candidate.ok():
             return False
-        checks = [
-            (self.config.status_code, self._status_equal(baseline, candidate)),
-            (self.config.length_check, self._length_within(baseline, candidate)),
-            (bool(self.config.need_all), self._need_all(candidate)),
-            (bool(self.config.need_any), self._need_any(candidate)),
-            (bool(self._regex), self._regex_match(candidate)),
-        ]
-        active = [result for enabled, result in checks if enabled]
-        if not active:
+        if not self._checks:
             return True
-        if self.config.logic.upper() == "OR":
-            return any(active)
-        return all(active)
+        if self._any_logic:
+            return any(check(baseline, candidate) for check in self._checks)
+        return all(check(baseline, candidate) for check in self._checks)
 
     def _status_equal(self, base: ResponseSnapshot, cand: ResponseSnapshot) -> bool:
         return base.status_code == cand.status_code
@@ -40,16 +69,28 @@ class ResponseComparator:
         return delta <= self.config.length_tolerance
 
     def _need_all(self, cand: ResponseSnapshot) -> bool:
-        if cand.body is None:
+        body = cand.body
+        if body is None:
             return False
-        return all(token in cand.body for token in self.config.need_all)
+        if self._all_automaton is None:
+            return all(token in body for token in self._all_tokens)
+        missing = set(self._all_tokens)
+        for _, token in self._all_automaton.iter(body):
+            missing.discard(token)
+            if not missing:
+                return True
+        return False
 
     def _need_any(self, cand: ResponseSnapshot) -> bool:
-        if cand.body is None:
+        body = cand.body
+        if body is None:
             return False
-        return any(token in cand.body for token in self.config.need_any)
+        if self._any_automaton is None:
+            return any(token in body for token in self._any_tokens)
+        return next(self._any_automaton.iter(body), None) is not None
 
     def _regex_match(self, cand: ResponseSnapshot) -> bool:
-        if cand.body is None:
+        body = cand.body
+        if body is None:
             return False
-        return all(pattern.search(cand.body) for pattern in self._regex)
+        return all(pattern.search(body) for pattern in self._regex)
@@ -20,6 +20,9 @@ class ClientConfig:
     proxies: Dict[str, str] = field(default_factory=dict)
     verify_tls: bool = True
     rate_limit: RateLimitConfig = field(default_factory=RateLimitConfig)
+    response_cache_size: int = 4096
+    response_cache_bytes: int = 64 * 1024 * 1024
+    http2: bool = False
 
 
 @dataclass
@@ -45,6 +48,7 @@ class MinimizationConfig:
     headers: HeaderMinConfig = field(default_factory=HeaderMinConfig)
     body: BodyMinConfig = field(default_factory=BodyMinConfig)
     order: List[str] = field(default_factory=lambda: ["headers", "body"])
+    parallel_probes: int = 1
 
 
 @dataclass
@@ -133,6 +137,7 @@ def _build_min_config(data: Dict[str, Any]) -> MinimizationConfig:
         headers=HeaderMinConfig(**data.get("headers", {})),
         body=BodyMinConfig(**data.get("body", {})),
         order=data.get("order", ["headers", "body"]),
+        parallel_probes=int(data.get("parallel_probes", 1)),
     )
 
 
@@ -153,4 +158,7 @@ def _build_client_config(data: Dict[str, Any]) -> ClientConfig:
             requests_per_second=_to_optional_float(rate.get("requests_per_second")),
             max_concurrent=int(rate.get("max_concurrent", 1)),
         ),
+        response_cache_size=int(data.get("response_cache_size", 4096)),
+        response_cache_bytes=int(data.get("response_cache_bytes", 64 * 1024 * 1024)),
+        http2=bool(data.get("http2", False)),
     )
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import logging
-import re
 from typing import Iterable, List, Tuple
 
+from ._regex_cache import compile_re
 from .config import FilterConfig, ScopeConfig
 from .har_loader import HarEntry
 
@@ -14,8 +14,11 @@ class RequestFilter:
     def __init__(self, filter_config: FilterConfig, scope_config: ScopeConfig):
         self.config = filter_config
         self.scope = scope_config
-        self._url_regex = [re.compile(p) for p in filter_config.url_regex]
-        self._scope_regex = [re.compile(p) for p in scope_config.include_regex]
+        self._methods = {m.upper() for m in filter_config.methods}
+        self._hosts = set(filter_config.hosts)
+        self._include_urls = set(scope_config.include_urls)
+        self._url_regex = [compile_re(p) for p in filter_config.url_regex]
+        self._scope_regex = [compile_re(p) for p in scope_config.include_regex]
 
     def apply(self, entries: Iterable[HarEntry]) -> List[HarEntry]:
         results: List[HarEntry] = []
@@ -35,15 +38,10 @@ class RequestFilter:
     def _matches_filter(self, entry: HarEntry) -> bool:
         request = entry.request
         cfg = self.config
-        if cfg.methods and request.method.upper() not in {m.upper() for m in cfg.methods}:
+        if self._methods and request.method.upper() not in self._methods:
+            return False
+        if self._hosts and request.host not in self._hosts:
             return False
-        if cfg.hosts:
-            if request.path and request.url:
-                host = re.sub(r"^https?://", "", request.url).split("/")[0]
-            else:
-                host = ""
-            if host not in cfg.hosts:
-                return False
         if cfg.url_regex and not any(r.search(request.url) for r in self._url_regex):
             return False
         if cfg.index_range:
@@ -54,9 +52,9 @@ class RequestFilter:
 
     def _matches_scope(self, entry: HarEntry) -> bool:
         request = entry.request
-        if not (self.scope.include_urls or self.scope.include_regex):
+        if not (self._include_urls or self._scope_regex):
             return True
-        url_matches = request.url in set(self.scope.include_urls)
+        url_matches = request.url in self._include_urls
         regex_matches = any(r.search(request.url) for r in self._scope_regex)
         return url_matches or regex_matches
 
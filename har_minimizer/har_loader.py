@@ -1,15 +1,61 @@
 from __future__ import annotations
 
-import json
+import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
-from urllib.parse import urlparse, parse_qs
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import unquote_plus, urlsplit
 
+import ijson
+
+from . import _json_compat
 from .models import RequestData
 
+# yajl 会把 \ud800 这类代理项转义错误地解码为 "?"，或直接抛出 UnicodeDecodeError
+_SURROGATE_ESCAPE = re.compile(rb"\\u[dD][89a-fA-F]")
+
+
+class _SurrogateEscapeFound(Exception):
+    pass
+
+
+class _GuardedReader:
+    """边读边检查代理项转义；命中时在该段内容被解析之前中断流式读取。"""
+
+    def __init__(self, handle):
+        self._handle = handle
+        self._tail = b""
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._handle.read(size)
+        if _SURROGATE_ESCAPE.search(self._tail + chunk):
+            raise _SurrogateEscapeFound
+        self._tail = chunk[-5:]
+        return chunk
 
-@dataclass
+
+def parse_query(query: str) -> Dict[str, Any]:
+    """等价于 ``parse_qs`` 后把单值列表展开：重复键保留为列表，空值被忽略。"""
+    result: Dict[str, Any] = {}
+    if not query:
+        return result
+    for part in query.split("&"):
+        key, sep, value = part.partition("=")
+        if not sep or not value:
+            continue
+        key = unquote_plus(key)
+        value = unquote_plus(value)
+        existing = result.get(key)
+        if existing is None:
+            result[key] = value
+        elif isinstance(existing, list):
+            existing.append(value)
+        else:
+            result[key] = [existing, value]
+    return result
+
+
+@dataclass(slots=True)
 class HarEntry:
     index: int
     request: RequestData
@@ -19,33 +65,55 @@ class HarLoader:
     def __init__(self, path: str):
         self.path = Path(path)
         self.raw_data: Optional[Dict] = None
+        self.entry_count = 0
 
     def load(self) -> List[HarEntry]:
-        with self.path.open("r", encoding="utf-8") as handle:
-            data = json.load(handle)
-        self.raw_data = data
-        entries = data.get("log", {}).get("entries", [])
-        wrapped: List[HarEntry] = []
-        for idx, entry in enumerate(entries):
-            req = entry.get("request", {})
-            headers = req.get("headers", [])
-            parsed_url = urlparse(req.get("url", ""))
-            query = {k: v[0] if len(v) == 1 else v for k, v in parse_qs(parsed_url.query).items()}
-            request = RequestData(
-                index=idx,
-                method=req.get("method", "GET"),
-                url=req.get("url", ""),
-                path=parsed_url.path,
-                query=query,
-                headers=headers,
-                body_text=(req.get("postData", {}) or {}).get("text"),
-                mime_type=(req.get("postData", {}) or {}).get("mimeType"),
-                raw_entry=entry,
-            )
-            wrapped.append(HarEntry(index=idx, request=request))
-        return wrapped
+        return list(self.iter_entries())
+
+    def iter_entries(self) -> Iterator[HarEntry]:
+        """用 ijson 流式读取 ``log.entries``，任一时刻只有当前条目的解析树驻留内存。
+
+        导出所需的完整文档由 ``get_raw`` 按需另行解析。
+        """
+        self.entry_count = 0
+        with self.path.open("rb") as handle:
+            items = ijson.items(_GuardedReader(handle), "log.entries.item", use_float=True)
+            while True:
+                try:
+                    entry = next(items)
+                except StopIteration:
+                    return
+                except (ijson.JSONError, _SurrogateEscapeFound):
+                    # yajl 不接受 NaN、超出 64 位的整数等写法，也处理不好代理项转义，
+                    # 此时从尚未产出的条目起改为整体解析
+                    break
+                yield self._wrap(self.entry_count, entry)
+        entries = self._read().get("log", {}).get("entries", [])
+        for idx in range(self.entry_count, len(entries)):
+            yield self._wrap(idx, entries[idx])
+
+    def _wrap(self, idx: int, entry: Dict) -> HarEntry:
+        req = entry.get("request", {})
+        headers = req.get("headers", [])
+        parsed_url = urlsplit(req.get("url", ""))
+        request = RequestData(
+            index=idx,
+            method=req.get("method", "GET"),
+            url=req.get("url", ""),
+            host=parsed_url.netloc,
+            path=parsed_url.path,
+            query=parse_query(parsed_url.query),
+            headers=headers,
+            body_text=(req.get("postData", {}) or {}).get("text"),
+            mime_type=(req.get("postData", {}) or {}).get("mimeType"),
+        )
+        self.entry_count = idx + 1
+        return HarEntry(index=idx, request=request)
 
     def get_raw(self) -> Dict:
         if self.raw_data is None:
-            raise RuntimeError("HAR 内容尚未加载")
+            self.raw_data = self._read()
         return self.raw_data
+
+    def _read(self) -> Dict:
+        return _json_compat.loads(self.path.read_bytes())
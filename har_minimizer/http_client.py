@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import threading
 import time
+from collections import OrderedDict
 from typing import Dict, Optional
 
 import requests
@@ -9,8 +12,19 @@ import requests
 from .config import ClientConfig
 from .models import RequestData, ResponseSnapshot
 
+try:
+    import httpx
+except ImportError:  # 可选依赖：pip install har-minimizer[http2]
+    httpx = None
+
 
 class RateLimiter:
+    """令牌桶限速器。
+
+    锁内只做记账：扣除一个令牌，不足时记为欠额并换算出需要等待的时长；
+    真正的 sleep 在锁外进行，多个线程可同时等待各自的时间片而不互相阻塞。
+    """
+
     def __init__(self, requests_per_second: Optional[float]):
         self.rps = requests_per_second
         self._lock = threading.Lock()
@@ -27,12 +41,18 @@ class RateLimiter:
             self._allowance += elapsed * self.rps
             if self._allowance > self.rps:
                 self._allowance = self.rps
-            if self._allowance < 1.0:
-                sleep_time = (1.0 - self._allowance) / self.rps
-                time.sleep(max(0.0, sleep_time))
-                self._allowance = 0.0
-            else:
-                self._allowance -= 1.0
+            self._allowance -= 1.0
+            sleep_time = -self._allowance / self.rps if self._allowance < 0 else 0.0
+        if sleep_time > 0:
+            time.sleep(sleep_time)
+
+
+_TRANSPORT_ERRORS = (requests.RequestException,) + ((httpx.HTTPError,) if httpx is not None else ())
+
+
+def _snapshot_cost(snapshot: ResponseSnapshot) -> int:
+    # 缓存的快照除原始字节外还可能持有懒解码后的文本，按两倍字节数估算
+    return 2 * snapshot.length
 
 
 class HttpClient:
@@ -40,37 +60,123 @@ class HttpClient:
         self.config = config
         self.rate_limiter = RateLimiter(config.rate_limit.requests_per_second)
         self._local = threading.local()
+        self._cache_size = max(0, config.response_cache_size)
+        self._cache_budget = max(0, config.response_cache_bytes)
+        self._cache_bytes = 0
+        self._cache: "OrderedDict[bytes, ResponseSnapshot]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._http2_client = self._build_http2_client() if config.http2 else None
+
+    def close(self) -> None:
+        if self._http2_client is not None:
+            self._http2_client.close()
 
     def send(self, request: RequestData, headers: Dict[str, str], body: Optional[str]) -> ResponseSnapshot:
+        payload = body if body is not None else request.body_text
+        key = self._cache_key(request, headers, payload) if self._cache_size and self._cache_budget else None
+        if key is not None:
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
         self.rate_limiter.wait()
         start = time.monotonic()
+        data = payload.encode("utf-8", "surrogatepass") if isinstance(payload, str) else payload
         try:
-            session = self._get_session()
-            response = session.request(
-                method=request.method,
-                url=request.url,
-                headers=headers,
-                data=body if body is not None else request.body_text,
-                timeout=self.config.timeout,
-                verify=self.config.verify_tls,
-            )
+            if self._http2_client is not None:
+                # requests 会按实际请求体重算 Content-Length，httpx 则照搬传入的值，这里交给 httpx 自行计算
+                response = self._http2_client.request(
+                    request.method,
+                    request.url,
+                    headers={k: v for k, v in headers.items() if k.lower() != "content-length"},
+                    content=data,
+                )
+                encoding = response.charset_encoding
+            else:
+                response = self._get_session().request(
+                    method=request.method,
+                    url=request.url,
+                    headers=headers,
+                    data=data,
+                    timeout=self.config.timeout,
+                    verify=self.config.verify_tls,
+                )
+                encoding = response.encoding
             elapsed = time.monotonic() - start
-            return ResponseSnapshot(
+            snapshot = ResponseSnapshot(
                 status_code=response.status_code,
-                body=response.text,
+                content=response.content,
                 elapsed=elapsed,
                 error=None,
                 headers=dict(response.headers),
+                encoding=encoding,
             )
-        except requests.RequestException as exc:
+        except _TRANSPORT_ERRORS as exc:
             elapsed = time.monotonic() - start
             return ResponseSnapshot(
                 status_code=None,
-                body=None,
+                content=None,
                 elapsed=elapsed,
                 error=str(exc),
                 headers={},
             )
+        if key is not None:
+            self._cache_put(key, snapshot)
+        return snapshot
+
+    def _cache_key(self, request: RequestData, headers: Dict[str, str], body: Optional[str]) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (
+            request.method.upper(),
+            request.url,
+            json.dumps(sorted(headers.items()), ensure_ascii=False),
+            "" if body is None else "\x00" + body,
+        ):
+            digest.update(part.encode("utf-8", "surrogatepass"))
+            digest.update(b"\xff")
+        return digest.digest()
+
+    def _cache_get(self, key: bytes) -> Optional[ResponseSnapshot]:
+        with self._cache_lock:
+            snapshot = self._cache.get(key)
+            if snapshot is not None:
+                self._cache.move_to_end(key)
+            return snapshot
+
+    def _cache_put(self, key: bytes, snapshot: ResponseSnapshot) -> None:
+        # 缓存除网络异常外的所有响应（含 4xx/5xx）；网络异常等瞬时错误下次仍会重新请求
+        cost = _snapshot_cost(snapshot)
+        if cost > self._cache_budget:
+            return
+        with self._cache_lock:
+            previous = self._cache.pop(key, None)
+            if previous is not None:
+                self._cache_bytes -= _snapshot_cost(previous)
+            self._cache[key] = snapshot
+            self._cache_bytes += cost
+            while len(self._cache) > self._cache_size or self._cache_bytes > self._cache_budget:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= _snapshot_cost(evicted)
+
+    def _build_http2_client(self) -> "httpx.Client":
+        # 所有线程共用一个客户端：同一主机的并发探测复用少量连接，以 HTTP/2 多路复用并行发送
+        if httpx is None:
+            raise RuntimeError("client.http2 需要安装可选依赖：pip install har-minimizer[http2]")
+        mounts = {
+            (scheme if scheme.endswith("://") else f"{scheme}://"): httpx.HTTPTransport(
+                proxy=proxy,
+                http2=True,
+                verify=self.config.verify_tls,
+            )
+            for scheme, proxy in self.config.proxies.items()
+        }
+        return httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+            timeout=self.config.timeout,
+            verify=self.config.verify_tls,
+            mounts=mounts or None,
+            follow_redirects=True,
+        )
 
     def _get_session(self) -> requests.Session:
         session = getattr(self._local, "session", None)
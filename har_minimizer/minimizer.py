@@ -4,10 +4,15 @@ import json
 import logging
 import math
 import re
-from copy import deepcopy
-from typing import Dict, List, Optional, Sequence, Tuple
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 from urllib.parse import urlencode, parse_qsl
 
+import orjson
+
+from ._json_compat import parse_constant
+from ._regex_cache import compile_re
 from .config import Config
 from .http_client import HttpClient
 from .models import MinimizationResult, RequestData, ResponseSnapshot
@@ -21,7 +26,8 @@ def _headers_list_to_dict(headers: Sequence[Dict[str, str]]) -> Dict[str, str]:
     result: Dict[str, str] = {}
     for header in headers:
         name = header.get("name")
-        if not name:
+        # HTTP/2 抓包中的伪头部（:authority 等）无法通过 HTTP/1.1 会话发送
+        if not name or name.startswith(":"):
             continue
         result[name] = header.get("value", "")
     return result
@@ -38,78 +44,108 @@ def resolve_body_kind(request: RequestData, mode: str) -> str:
     return mode
 
 
-def _parse_body(request: RequestData, mode: str) -> Tuple[str, Optional[Dict[str, str]]]:
+def _parse_body(request: RequestData, mode: str) -> Tuple[str, Optional[Dict[str, str]], int]:
+    """解析请求体，返回 (类型, 字段表, 原始字段数)；表单重复键按出现次数计数。"""
     body = request.body_text or ""
     kind = resolve_body_kind(request, mode)
     if kind == "json":
         try:
-            parsed = json.loads(body) if body else {}
+            parsed = json.loads(body, parse_constant=parse_constant) if body else {}
         except json.JSONDecodeError:
-            return "raw", None
+            return "raw", None, 0
         if isinstance(parsed, dict):
-            return "json", {k: parsed[k] for k in parsed}
-        return "raw", None
+            return "json", {k: parsed[k] for k in parsed}, len(parsed)
+        return "raw", None, 0
     if kind == "form":
-        pairs = dict(parse_qsl(body, keep_blank_values=True))
-        return "form", pairs
-    return "raw", None
+        pairs = parse_qsl(body, keep_blank_values=True)
+        return "form", dict(pairs), len(pairs)
+    return "raw", None, 0
 
 
 def _build_body_text(kind: str, data: Optional[Dict[str, str]]) -> Optional[str]:
     if data is None:
         return None
     if kind == "json":
-        return json.dumps(data, separators=(",", ":"))
+        try:
+            return orjson.dumps(data).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # 超出 64 位的整数、NaN/Infinity、孤立代理项等 orjson 无法原样编码的值交给标准库
+            return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
     if kind == "form":
         return urlencode(data)
     return None
 
 
-def count_body_fields(kind: str, body_text: Optional[str]) -> int:
-    if not body_text:
-        return 0
-    if kind == "json":
-        try:
-            parsed = json.loads(body_text)
-        except json.JSONDecodeError:
-            return 0
-        if isinstance(parsed, dict):
-            return len(parsed)
-        return 0
-    if kind == "form":
-        return len(parse_qsl(body_text, keep_blank_values=True))
-    return 0
-
-
-def _ddmin(items: Sequence, test_func, max_tests: Optional[int]) -> Tuple[List, int]:
+def _without_range(collection: List, start: int, stop: int) -> List:
+    # 一次拷贝后原地删除区间，避免两次切片再拼接产生的临时列表
+    remainder = collection.copy()
+    del remainder[start:stop]
+    return remainder
+
+
+def _ddmin(
+    items: Sequence,
+    test_func: Callable[[List], Any],
+    max_tests: Optional[int],
+    executor: Optional[Executor] = None,
+    batch_size: int = 1,
+) -> Tuple[List, int, Any]:
+    """ddmin 主循环。
+
+    ``test_func`` 通过时返回真值（作为该组合的凭据），失败返回 ``None``/假值；
+    返回值为 (最小集合, 测试次数, 最后一次被采纳的凭据)。多于一个候选时会先
+    探测空集，可整体删除则直接返回。提供 ``executor`` 时，
+    同一轮内的候选会按 ``batch_size`` 成批并发探测，并选取序号最小的通过项；
+    不设 ``max_tests`` 时结果与串行执行一致，设了上限时投机探测会更快耗尽预算。
+    """
     collection = list(items)
     if not collection:
-        return [], 0
+        return [], 0, None
     if max_tests is not None and max_tests <= 0:
-        return collection, 0
+        return collection, 0, None
+    if executor is None:
+        batch_size = 1
     n = 2
     tests = 0
+    accepted = None
+    if len(collection) > 1:
+        # 先尝试一次性删除全部候选，空集即可通过时无需进入 ddmin 循环
+        # （单个候选时 ddmin 的第一次探测本身就是空集，不必重复）
+        tests += 1
+        outcome = test_func([])
+        if outcome:
+            return [], tests, outcome
     while len(collection) >= 1:
         subset_size = math.ceil(len(collection) / n)
-        start = 0
+        starts = range(0, len(collection), subset_size)
         removed = False
-        while start < len(collection):
+        offset = 0
+        while offset < len(starts):
             if max_tests is not None and tests >= max_tests:
-                return collection, tests
-            subset = collection[start : start + subset_size]
-            remainder = collection[:start] + collection[start + subset_size :]
-            tests += 1
-            if test_func(remainder):
-                collection = remainder
-                n = max(n - 1, 2)
-                removed = True
+                return collection, tests, accepted
+            size = batch_size if max_tests is None else min(batch_size, max_tests - tests)
+            batch = starts[offset : offset + size]
+            remainders = [_without_range(collection, start, start + subset_size) for start in batch]
+            tests += len(remainders)
+            if len(remainders) == 1:
+                outcomes = [test_func(remainders[0])]
+            else:
+                outcomes = list(executor.map(test_func, remainders))
+            for remainder, outcome in zip(remainders, outcomes):
+                if outcome:
+                    collection = remainder
+                    accepted = outcome
+                    n = max(n - 1, 2)
+                    removed = True
+                    break
+            if removed:
                 break
-            start += subset_size
+            offset += len(batch)
         if not removed:
             if n >= len(collection):
                 break
             n = min(len(collection), n * 2)
-    return collection, tests
+    return collection, tests, accepted
 
 
 class RequestMinimizer:
@@ -117,12 +153,42 @@ class RequestMinimizer:
         self.config = config
         self.client = client
         self.comparator = comparator
+        self._header_regexes = [
+            compile_re(pattern, re.IGNORECASE) for pattern in config.minimization.headers.candidate_regex
+        ]
+        self._probe_workers = max(1, config.minimization.parallel_probes)
+        self._probe_executor: Optional[ThreadPoolExecutor] = None
+        self._probe_lock = threading.Lock()
+
+    def close(self) -> None:
+        """关闭并发探测线程池；之后再次最小化时会按需重新创建。"""
+        with self._probe_lock:
+            executor, self._probe_executor = self._probe_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _get_probe_executor(self) -> Optional[ThreadPoolExecutor]:
+        if self._probe_workers <= 1:
+            return None
+        with self._probe_lock:
+            if self._probe_executor is None:
+                self._probe_executor = ThreadPoolExecutor(
+                    max_workers=self._probe_workers,
+                    thread_name_prefix="ddmin-probe",
+                )
+            return self._probe_executor
 
     def minimize(self, request: RequestData) -> Tuple[Optional[ResponseSnapshot], MinimizationResult]:
         logger.info("正在处理请求 #%s %s", request.index, request.url)
-        original_headers = deepcopy(request.headers)
+        # 头部只会被重新组合成新列表，不会原地修改，浅拷贝即可
+        original_headers = list(request.headers)
         base_headers_dict = _headers_list_to_dict(original_headers)
         baseline = self.client.send(request, base_headers_dict, request.body_text)
+        body_kind = resolve_body_kind(request, self.config.minimization.body.body_type)
+        # 请求体只解析一次，原始字段数与后续各阶段都沿用这份解析结果
+        parsed_body = _parse_body(request, self.config.minimization.body.body_type)
+        original_fields = parsed_body[1]
+        original_body_fields = parsed_body[2]
         if not baseline.ok():
             logger.warning("请求 %s 的基线执行失败：%s", request.index, baseline.error)
             result = MinimizationResult(
@@ -134,11 +200,11 @@ class RequestMinimizer:
                 body_candidates=0,
                 minimized_headers=len(original_headers),
                 minimized_body_fields=0,
+                original_body_fields=original_body_fields,
             )
             return baseline, result
 
         remaining_tests = self.config.max_rounds_per_request
-        body_kind = resolve_body_kind(request, self.config.minimization.body.body_type)
         headers_state = original_headers
         header_candidates = 0
         best_header_combo = (headers_state, baseline)
@@ -153,19 +219,22 @@ class RequestMinimizer:
             remaining_tests = max(0, remaining_tests - tests)
 
         body_state = request.body_text
+        body_state_fields = original_fields
         body_candidates = 0
         best_body_combo = (body_state, best_header_combo[1])
         if "body" in self.config.minimization.order and self.config.minimization.body.enabled:
             (
                 body_state,
+                body_state_fields,
                 body_candidates,
                 best_body_combo,
                 tests,
-            ) = self._minimize_body(request, headers_state, baseline, max(0, remaining_tests))
+            ) = self._minimize_body(request, headers_state, baseline, max(0, remaining_tests), parsed_body)
             remaining_tests = max(0, remaining_tests - tests)
 
         final_headers = headers_state
         final_body = body_state
+        final_fields = body_state_fields
         final_response = self.client.send(request, _headers_list_to_dict(final_headers), final_body)
         matched = self.comparator.equivalent(baseline, final_response)
         if not matched:
@@ -180,11 +249,13 @@ class RequestMinimizer:
             elif fallback_response and self.comparator.equivalent(baseline, fallback_response):
                 final_headers = fallback_headers
                 final_body = request.body_text
+                final_fields = original_fields
                 final_response = fallback_response
                 matched = True
             else:
                 final_headers = original_headers
                 final_body = request.body_text
+                final_fields = original_fields
                 final_response = baseline
                 matched = True  # 回退至基线请求
         # 额外尝试将剩余字段值置空
@@ -195,11 +266,16 @@ class RequestMinimizer:
                 baseline=baseline,
                 body_kind=body_kind,
                 current_body=final_body,
+                current_fields=final_fields,
             )
             if blank_attempt is not None:
                 final_body, final_response = blank_attempt
                 matched = self.comparator.equivalent(baseline, final_response)
-        final_body_fields = count_body_fields(body_kind, final_body)
+        if final_body == request.body_text:
+            final_body_fields = original_body_fields
+        else:
+            # 置空只改变取值不改变字段数，最小化后的字段表即可给出计数
+            final_body_fields = len(final_fields) if final_fields else 0
         result = MinimizationResult(
             headers=final_headers,
             body_text=final_body,
@@ -209,9 +285,13 @@ class RequestMinimizer:
             body_candidates=body_candidates,
             minimized_headers=len(final_headers),
             minimized_body_fields=final_body_fields,
+            original_body_fields=original_body_fields,
         )
         return baseline, result
 
+    def _run_ddmin(self, items: Sequence, test_func, max_tests: Optional[int]) -> Tuple[List, int, Any]:
+        return _ddmin(items, test_func, max_tests, self._get_probe_executor(), self._probe_workers)
+
     def _minimize_headers(
         self,
         request: RequestData,
@@ -222,12 +302,13 @@ class RequestMinimizer:
         cfg = self.config.minimization.headers
         protected = {h.lower() for h in cfg.protected}
         ignored = {h.lower() for h in cfg.ignore}
-        regexes = [re.compile(pattern, re.IGNORECASE) for pattern in cfg.candidate_regex]
+        regexes = self._header_regexes
         candidates: List[Dict[str, str]] = []
         fixed: List[Dict[str, str]] = []
         for header in current_headers:
             name = header.get("name", "").lower()
-            if name in protected or name in ignored:
+            # 伪头部从不发送，不参与删减，避免浪费探测次数
+            if name in protected or name in ignored or name.startswith(":"):
                 fixed.append(header)
                 continue
             if regexes and not any(r.search(name) for r in regexes):
@@ -237,18 +318,19 @@ class RequestMinimizer:
         if not candidates:
             return current_headers, 0, (current_headers, baseline), 0
 
-        best_state = (current_headers, baseline)
+        fixed_dict = _headers_list_to_dict(fixed)
 
-        def test(active_headers: List[Dict[str, str]]) -> bool:
-            nonlocal best_state
+        def test(active_headers: List[Dict[str, str]]) -> Optional[Tuple[List[Dict[str, str]], ResponseSnapshot]]:
             headers = fixed + active_headers
-            response = self.client.send(request, _headers_list_to_dict(headers), request.body_text)
+            header_dict = dict(fixed_dict)
+            header_dict.update(_headers_list_to_dict(active_headers))
+            response = self.client.send(request, header_dict, request.body_text)
             if self.comparator.equivalent(baseline, response):
-                best_state = (headers, response)
-                return True
-            return False
+                return headers, response
+            return None
 
-        minimized, tests = _ddmin(candidates, test, max_tests)
+        minimized, tests, accepted = self._run_ddmin(candidates, test, max_tests)
+        best_state = accepted or (current_headers, baseline)
         minimized_headers = fixed + minimized
         if best_state[0] != minimized_headers:
             minimized_headers = best_state[0]
@@ -260,49 +342,47 @@ class RequestMinimizer:
         headers: List[Dict[str, str]],
         baseline: ResponseSnapshot,
         max_tests: int,
-    ) -> Tuple[Optional[str], int, Tuple[Optional[str], ResponseSnapshot], int]:
+        parsed_body: Tuple[str, Optional[Dict[str, str]], int],
+    ) -> Tuple[Optional[str], Optional[Dict[str, str]], int, Tuple[Optional[str], ResponseSnapshot], int]:
         cfg = self.config.minimization.body
-        kind, parsed = _parse_body(request, cfg.body_type)
+        kind, parsed, _ = parsed_body
         if parsed is None or not parsed:
-            return request.body_text, 0, (request.body_text, baseline), 0
+            return request.body_text, parsed, 0, (request.body_text, baseline), 0
         protected = set(cfg.protected_keys)
         only = set(cfg.only_keys) if cfg.only_keys else None
         candidates = {k: v for k, v in parsed.items() if k not in protected and (not only or k in only)}
         if not candidates:
-            return request.body_text, 0, (request.body_text, baseline), 0
-
-        fixed = {k: v for k, v in parsed.items() if k not in candidates}
-        candidate_items = list(candidates.items())
-        best_state = (request.body_text, baseline)
-
-        candidate_keys = [k for k, _ in candidate_items]
-
-        def build_body(active_items: List[Tuple[str, str]]) -> Dict[str, str]:
-            merged = dict(fixed)
-            active_lookup = {k: v for k, v in active_items}
-            for key, value in active_lookup.items():
-                merged[key] = value
-            if not cfg.treat_empty_as_absent:
-                for key in candidate_keys:
-                    if key not in active_lookup:
-                        merged[key] = ""
+            return request.body_text, parsed, 0, (request.body_text, baseline), 0
+
+        # ddmin 只在下标上操作，键/值各存一份并行列表，每次探测只需一次字典拷贝
+        keys = list(candidates.keys())
+        values = list(candidates.values())
+        template = {k: v for k, v in parsed.items() if k not in candidates}
+        if not cfg.treat_empty_as_absent:
+            template.update((key, "") for key in keys)
+        header_dict = _headers_list_to_dict(headers)
+
+        def build_body(active_indices: List[int]) -> Dict[str, str]:
+            merged = dict(template)
+            for index in active_indices:
+                merged[keys[index]] = values[index]
             return merged
 
-        def test(active_items: List[Tuple[str, str]]) -> bool:
-            nonlocal best_state
-            body_map = build_body(active_items)
+        def test(active_indices: List[int]) -> Optional[Tuple[Optional[str], ResponseSnapshot]]:
+            body_map = build_body(active_indices)
             body_text = _build_body_text(kind, body_map)
-            response = self.client.send(request, _headers_list_to_dict(headers), body_text)
+            response = self.client.send(request, header_dict, body_text)
             if self.comparator.equivalent(baseline, response):
-                best_state = (body_text, response)
-                return True
-            return False
+                return body_text, response
+            return None
 
-        minimized, tests = _ddmin(candidate_items, test, max_tests)
+        minimized, tests, accepted = self._run_ddmin(range(len(keys)), test, max_tests)
+        best_state = accepted or (request.body_text, baseline)
         final_body, _ = best_state
+        final_fields = build_body(minimized) if accepted else parsed
         if final_body is None:
-            final_body = _build_body_text(kind, build_body(minimized))
-        return final_body, len(candidate_items), best_state, tests
+            final_body = _build_body_text(kind, final_fields)
+        return final_body, final_fields, len(keys), best_state, tests
 
     def _try_blank_body_values(
         self,
@@ -311,25 +391,19 @@ class RequestMinimizer:
         baseline: ResponseSnapshot,
         body_kind: str,
         current_body: Optional[str],
+        current_fields: Optional[Dict[str, str]],
     ) -> Optional[Tuple[Optional[str], ResponseSnapshot]]:
-        if body_kind not in {"json", "form"} or not current_body:
+        if body_kind not in {"json", "form"} or not current_body or current_fields is None:
             return None
         cfg = self.config.minimization.body
-        try:
-            if body_kind == "json":
-                parsed = json.loads(current_body) if current_body else {}
-                if not isinstance(parsed, dict):
-                    return None
-            else:
-                parsed = dict(parse_qsl(current_body, keep_blank_values=True))
-        except json.JSONDecodeError:
-            return None
+        parsed = current_fields
         protected = set(cfg.protected_keys)
         only = set(cfg.only_keys) if cfg.only_keys else None
         candidate_keys = [k for k in parsed.keys() if k not in protected and (not only or k in only)]
         if not candidate_keys:
             return None
         best_state: Tuple[Optional[str], Optional[ResponseSnapshot]] = (current_body, None)
+        header_dict = _headers_list_to_dict(headers)
 
         def build_body(active_keys: List[str]) -> Dict[str, str]:
             # active_keys = 保留原值的键，其余置空
@@ -340,20 +414,20 @@ class RequestMinimizer:
                     body_map[key] = ""
             return body_map
 
-        def test(active_keys: List[str]) -> bool:
-            nonlocal best_state
+        def test(active_keys: List[str]) -> Optional[Tuple[Optional[str], ResponseSnapshot]]:
             body_map = build_body(active_keys)
             body_text = _build_body_text(body_kind, body_map)
-            response = self.client.send(request, _headers_list_to_dict(headers), body_text)
+            response = self.client.send(request, header_dict, body_text)
             if self.comparator.equivalent(baseline, response):
-                best_state = (body_text, response)
-                return True
-            return False
+                return body_text, response
+            return None
 
-        minimized_keep, _ = _ddmin(candidate_keys, test, None)
+        minimized_keep, _, accepted = self._run_ddmin(candidate_keys, test, None)
+        if accepted:
+            best_state = accepted
         body_map = build_body(minimized_keep)
         body_text = _build_body_text(body_kind, body_map)
-        response = self.client.send(request, _headers_list_to_dict(headers), body_text)
+        response = self.client.send(request, header_dict, body_text)
         if self.comparator.equivalent(baseline, response):
             best_state = (body_text, response)
         if best_state[1] and best_state[0] != current_body:
@@ -4,43 +4,55 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, MutableMapping, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestData:
     """从 HAR 请求条目中提取的结构化信息。"""
 
     index: int
     method: str
     url: str
+    host: str
     path: str
     query: Dict[str, Any]
     headers: List[Dict[str, str]]
     body_text: Optional[str]
     mime_type: Optional[str]
-    raw_entry: Dict[str, Any]
 
     def header_dict(self) -> Dict[str, str]:
         return {h["name"].lower(): h.get("value", "") for h in self.headers}
 
 
-@dataclass
+@dataclass(slots=True)
 class ResponseSnapshot:
     status_code: Optional[int]
-    body: Optional[str]
+    content: Optional[bytes]
     error: Optional[str]
     elapsed: float
     headers: MutableMapping[str, str] = field(default_factory=dict)
+    encoding: Optional[str] = None
+    _text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def body(self) -> Optional[str]:
+        """响应文本，首次访问时才解码；只比较状态码/长度时无需解码。"""
+        if self._text is None and self.content is not None:
+            try:
+                self._text = self.content.decode(self.encoding or "utf-8", errors="replace")
+            except LookupError:
+                self._text = self.content.decode("utf-8", errors="replace")
+        return self._text
 
     @property
     def length(self) -> int:
-        if self.body is None:
+        if self.content is None:
             return 0
-        return len(self.body)
+        return len(self.content)
 
     def ok(self) -> bool:
         return self.error is None and self.status_code is not None
 
 
-@dataclass
+@dataclass(slots=True)
 class MinimizationResult:
     headers: List[Dict[str, str]]
     body_text: Optional[str]
@@ -50,9 +62,10 @@ class MinimizationResult:
     body_candidates: int
     minimized_headers: int
     minimized_body_fields: int
+    original_body_fields: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class ReportEntry:
     index: int
     method: str
@@ -71,7 +84,7 @@ class ReportEntry:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessedRequest:
     request: RequestData
     baseline: ResponseSnapshot
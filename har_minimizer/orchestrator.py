@@ -9,7 +9,7 @@ from .config import Config
 from .filtering import RequestFilter
 from .har_loader import HarLoader
 from .http_client import HttpClient
-from .minimizer import RequestMinimizer, count_body_fields, resolve_body_kind
+from .minimizer import RequestMinimizer
 from .models import MinimizationResult, ProcessedRequest, ReportEntry, RequestData, ResponseSnapshot
 from .reporting import HarExporter, ReportWriter
 
@@ -26,21 +26,26 @@ class MinimizationOrchestrator:
         self.minimizer = RequestMinimizer(config, self.client, self.comparator)
 
     def run(self) -> List[ReportEntry]:
-        entries = self.loader.load()
-        filtered = self.request_filter.apply(entries)
-        logger.info("共载入 %s 个请求，筛选后剩余 %s 个", len(entries), len(filtered))
+        filtered = self.request_filter.apply(self.loader.iter_entries())
+        logger.info("共载入 %s 个请求，筛选后剩余 %s 个", self.loader.entry_count, len(filtered))
         processed: List[ProcessedRequest] = []
         report_entries: List[ReportEntry] = []
-        max_workers = max(1, self.config.client.rate_limit.max_concurrent)
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(self._process_entry, entry): entry
-                for entry in filtered
-            }
-            for future in as_completed(futures):
-                processed_req, report = future.result()
-                processed.append(processed_req)
-                report_entries.append(report)
+        # 不同条目之间互不依赖，按 max_concurrent 并行处理；限速由共享的 RateLimiter 保证
+        max_workers = max(1, min(self.config.client.rate_limit.max_concurrent, len(filtered)))
+        logger.debug("使用 %s 个工作线程处理请求", max_workers)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(self._process_entry, entry): entry
+                    for entry in filtered
+                }
+                for future in as_completed(futures):
+                    processed_req, report = future.result()
+                    processed.append(processed_req)
+                    report_entries.append(report)
+        finally:
+            self.minimizer.close()
+            self.client.close()
         processed.sort(key=lambda item: item.request.index)
         report_entries.sort(key=lambda item: item.index)
         ReportWriter(self.config.report_path).write(report_entries)
@@ -68,9 +73,6 @@ class MinimizationOrchestrator:
         baseline: ResponseSnapshot,
         result: MinimizationResult,
     ) -> ReportEntry:
-        body_kind = resolve_body_kind(request, self.config.minimization.body.body_type)
-        original_body_fields = count_body_fields(body_kind, request.body_text)
-        final_body_fields = count_body_fields(body_kind, result.body_text)
         error_message = None
         if not baseline.ok():
             error_message = baseline.error
@@ -93,9 +95,9 @@ class MinimizationOrchestrator:
                 "final": len(result.headers),
             },
             body_counts={
-                "original": original_body_fields,
+                "original": result.original_body_fields,
                 "candidates": result.body_candidates,
-                "final": final_body_fields,
+                "final": result.minimized_body_fields,
             },
             minimized_headers=result.headers,
             minimized_body=result.body_text,
@@ -1,13 +1,73 @@
 from __future__ import annotations
 
 import json
-from copy import deepcopy
 from pathlib import Path
-from typing import Dict, Iterable, List
-from urllib.parse import urlparse, parse_qs
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+import orjson
 
 from .models import MinimizationResult, ProcessedRequest, ReportEntry
 from .filtering import build_dedup_key
+from .har_loader import parse_query
+
+
+def _dump_json(data) -> bytes:
+    try:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        # 超出 64 位的整数、NaN/Infinity、孤立代理项等 orjson 无法原样编码的内容，退回标准库（转义非 ASCII）
+        return json.dumps(data, indent=2).encode("utf-8")
+
+
+def _indent(chunk: bytes, depth: int) -> bytes:
+    # JSON 字符串内的换行均已转义，直接替换换行即可把整块缩进到指定层级
+    return chunk.replace(b"\n", b"\n" + b"  " * depth) if depth else chunk
+
+
+def _iter_object(
+    obj: Dict,
+    depth: int,
+    stream_key: Optional[str] = None,
+    stream: Optional[Callable[[int], Iterator[bytes]]] = None,
+) -> Iterator[bytes]:
+    if not obj:
+        yield b"{}"
+        return
+    pad = b"\n" + b"  " * (depth + 1)
+    yield b"{"
+    for position, (key, value) in enumerate(obj.items()):
+        yield (b"," if position else b"") + pad + _dump_json(str(key)) + b": "
+        if key == stream_key and stream is not None:
+            yield from stream(depth + 1)
+        else:
+            yield _indent(_dump_json(value), depth + 1)
+    yield b"\n" + b"  " * depth + b"}"
+
+
+def _iter_array(items: List, depth: int) -> Iterator[bytes]:
+    if not items:
+        yield b"[]"
+        return
+    pad = b"\n" + b"  " * (depth + 1)
+    yield b"["
+    for position, item in enumerate(items):
+        yield (b"," if position else b"") + pad + _indent(_dump_json(item), depth + 1)
+    yield b"\n" + b"  " * depth + b"]"
+
+
+def _iter_har_chunks(raw: Dict) -> Iterator[bytes]:
+    """按条目分块编码 HAR，输出与整体编码一致，但任一时刻只持有单个条目的编码结果。"""
+    log = raw.get("log")
+    if not isinstance(log, dict) or not isinstance(log.get("entries"), list):
+        yield _dump_json(raw)
+        return
+    entries = log["entries"]
+
+    def stream_log(depth: int) -> Iterator[bytes]:
+        return _iter_object(log, depth, "entries", lambda inner: _iter_array(entries, inner))
+
+    yield from _iter_object(raw, 0, "log", stream_log)
 
 
 class ReportWriter:
@@ -18,7 +78,7 @@ class ReportWriter:
         data = [self._to_dict(entry) for entry in entries]
         if self.path.parent and not self.path.parent.exists():
             self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        self.path.write_bytes(_dump_json(data))
 
     def _to_dict(self, entry: ReportEntry) -> Dict:
         return {
@@ -46,7 +106,14 @@ class ReportWriter:
 
 class HarExporter:
     def __init__(self, raw_har: Dict):
-        self.raw = deepcopy(raw_har)
+        # 只复制外层结构；apply 修改条目前才复制被改动的那一条路径（写时复制），
+        # 其余条目及响应内容始终与调用方的原始 HAR 共享
+        self.raw = dict(raw_har)
+        log = self.raw.get("log")
+        if isinstance(log, dict):
+            log = self.raw["log"] = dict(log)
+            if "entries" in log:
+                log["entries"] = list(log["entries"])
 
     def apply(
         self,
@@ -61,18 +128,19 @@ class HarExporter:
             index = item.request.index
             if index >= len(entries):
                 continue
-            entry = entries[index]
-            request_block = entry.setdefault("request", {})
-            request_block["headers"] = deepcopy(item.result.headers)
+            entry = entries[index] = dict(entries[index])
+            request_block = entry["request"] = dict(entry.get("request") or {})
+            request_block["headers"] = [dict(h) for h in item.result.headers]
             if item.result.body_text is not None:
-                post_data = request_block.setdefault("postData", {})
+                post_data = request_block["postData"] = dict(request_block.get("postData") or {})
                 post_data["text"] = item.result.body_text
                 if item.request.mime_type:
                     post_data.setdefault("mimeType", item.request.mime_type)
             elif request_block.get("postData") and "text" in request_block["postData"]:
-                request_block["postData"]["text"] = item.request.body_text or ""
+                post_data = request_block["postData"] = dict(request_block["postData"])
+                post_data["text"] = item.request.body_text or ""
             if include_metadata:
-                meta = entry.setdefault("_minimized", {})
+                meta = entry["_minimized"] = dict(entry.get("_minimized") or {})
                 meta.update(
                     {
                         "original_header_count": len(item.request.headers),
@@ -89,7 +157,9 @@ class HarExporter:
         target = Path(path)
         if target.parent and not target.parent.exists():
             target.parent.mkdir(parents=True, exist_ok=True)
-        target.write_text(json.dumps(self.raw, indent=2, ensure_ascii=False), encoding="utf-8")
+        with target.open("wb") as handle:
+            for chunk in _iter_har_chunks(self.raw):
+                handle.write(chunk)
 
     def _deduplicate_entries(self) -> None:
         log = self.raw.get("log", {})
@@ -102,8 +172,7 @@ class HarExporter:
             method = request.get("method", "") or ""
             post_data = request.get("postData", {}) or {}
             body_text = post_data.get("text")
-            parsed = urlparse(url)
-            query_dict = {k: v[0] if len(v) == 1 else v for k, v in parse_qs(parsed.query).items()}
+            query_dict = parse_query(urlsplit(url).query)
             key = build_dedup_key(method=method, url=url, query=query_dict, body_text=body_text)
             if key in seen:
                 continue